@@ -54,11 +54,16 @@ import numpy as np
 import cartopy.crs as ccrs
 import cartopy.feature as feature
 
-hinterp = h.sel(lev=850).resample(time='1H').interpolate('linear') # select 850hPa
-lonsInt = lons.resample(time='1H').interpolate('linear')
-latsInt = lats.resample(time='1H').interpolate('linear')
-olonsI  = olon.resample(time='1H').interpolate('linear')
-olatsI  = olat.resample(time='1H').interpolate('linear')
+# 1-hourly sub-steps: centers move along the great circle and only the
+# sampled points are blended in time
+times = olon.time.resample(time='1H').asfreq().time
+
+hinterp, lonsInt, latsInt, _ = load_cylind(dset['h'].sel(lev=850), # select 850hPa
+                                           olon=olon, olat=olat,
+                                           azimNum=azimNum, radiNum=radiNum,
+                                           radMax=radMax, times=times)
+olonsI  = lonsInt.isel(radi=0, azim=0)
+olatsI  = latsInt.isel(radi=0, azim=0)
 
 fig = plt.figure(figsize=(3,3))
 
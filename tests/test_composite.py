@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+"""
+import numpy as np
+import pytest
+import xarray as xr
+from xvortices import Composite
+
+
+def samples(ns=40):
+    rng = np.random.default_rng(0)
+    x = xr.DataArray(rng.normal(size=(ns, 3, 4)), dims=('time', 'radi', 'azim'),
+                     coords={'radi':[0, 1, 2]})
+    x[3, 0, 0] = np.nan
+    return x, rng.uniform(0, 30, ns)
+
+
+def test_mean_var_merge():
+    x, lab = samples()
+    bins = [0, 10, 20, 30]
+
+    a = Composite(bins=bins)
+    b = Composite(bins=bins)
+    a.add(x[:15], by=lab[:15])
+    b.add(x[15:], by=lab[15:])
+    a.merge(b)
+
+    for i, (lo, hi) in enumerate(zip(bins[:-1], bins[1:])):
+        s = x.values[(lab >= lo) & (lab < hi)]
+        np.testing.assert_allclose(a.mean()[i], np.nanmean(s, axis=0))
+        np.testing.assert_allclose(a.var(ddof=1)[i], np.nanvar(s, axis=0, ddof=1))
+        np.testing.assert_array_equal(a.count()[i], np.isfinite(s).sum(0))
+
+
+def test_merge_different_bins():
+    x, lab = samples()
+    a = Composite(bins=[0, 10, 20])
+    b = Composite(bins=[0, 5, 10])
+    a.add(x, by=lab)
+    b.add(x, by=lab)
+
+    with pytest.raises(Exception):
+        a.merge(b)
+
+    with pytest.raises(Exception):
+        Composite().merge(b)
+
+
+def test_quantile():
+    rng = np.random.default_rng(1)
+    y = xr.DataArray(rng.normal(size=(5000, 2)), dims=('time', 'radi'))
+
+    c = Composite(hist_range=(-5, 5), hist_bins=500)
+    c.add(y)
+
+    np.testing.assert_allclose(c.quantile(0.9)[0],
+                               np.quantile(y.values, 0.9, axis=0), atol=0.02)
+
+
+def test_quantile_outside_range():
+    y = xr.DataArray(np.arange(100., 301.), dims='time')
+
+    c = Composite(hist_range=(0, 10), hist_bins=10)
+    c.add(y)
+
+    assert np.isnan(c.quantile(0.5)).all()
+    assert int(c.outside()[0]) == 201
+
+
+def test_mixed_labels():
+    x, _ = samples(4)
+    c = Composite()
+    c.add(x, by=['TS', 'TS', 'TY', 'TY'])
+
+    with pytest.raises(Exception):
+        c.add(x, by=1)
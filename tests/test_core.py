@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+from xvortices import load_cylind, relocate_center
+from xvortices.core import _bilinear_weights, _block_window
+
+
+times = pd.date_range('2004-01-01', periods=10, freq='6h')
+lat = np.linspace(60, 0, 61)
+lon = np.linspace(90, 160, 141)
+
+
+def synthetic_dataset():
+    rng = np.random.default_rng(0)
+    u = xr.DataArray(rng.normal(size=(10, 2, 61, 141)),
+                     dims=('time', 'lev', 'lat', 'lon'),
+                     coords={'time':times, 'lev':[850, 500], 'lat':lat, 'lon':lon},
+                     name='u')
+    return xr.Dataset({'u':u, 'v':u * 2})
+
+
+def synthetic_track(lon0=120, lon1=130, lat0=20, lat1=30):
+    olon = xr.DataArray(np.linspace(lon0, lon1, 10), dims='time',
+                        coords={'time':times})
+    olat = xr.DataArray(np.linspace(lat0, lat1, 10), dims='time',
+                        coords={'time':times})
+    return olon, olat
+
+
+def test_blockwise_equals_interp():
+    ds = synthetic_dataset()
+    olon, olat = synthetic_track()
+
+    ref, lons, lats, etas = load_cylind(ds, olon, olat, radMax=6)
+    new, lons2, lats2, etas2 = load_cylind(ds.chunk({'time':3, 'lev':1}),
+                                           olon, olat, radMax=6, blockwise=True)
+
+    for r, n in zip(ref, new):
+        assert n.dims == r.dims
+        np.testing.assert_allclose(n.values, r.values, atol=1e-12)
+
+    assert lons2.chunks[0] == (3, 3, 3, 1)
+    assert etas2.dims == etas.dims
+
+
+def test_blockwise_near_domain_edge():
+    ds = synthetic_dataset()
+    olon, olat = synthetic_track(lon0=150, lon1=158, lat0=50, lat1=58)
+
+    ref, _, _, _ = load_cylind(ds['u'], olon, olat, radMax=6)
+    new, _, _, _ = load_cylind(ds['u'].chunk({'time':2}), olon, olat,
+                               radMax=6, blockwise=True)
+
+    np.testing.assert_array_equal(np.isnan(new.values), np.isnan(ref.values))
+    np.testing.assert_allclose(new.values, ref.values, atol=1e-12)
+
+
+def test_block_window_ignores_outside_points():
+    xs = np.array([[155.0, 159.0, 170.0]])
+    ys = np.array([[55.0, 58.0, 65.0]])
+
+    j0, i0, wy, wx = _bilinear_weights(lon, lat, xs, ys)
+    jlo, jhi, ilo, ihi = _block_window(j0, i0, wy, wx, lat.size, lon.size)
+
+    assert (jlo, ilo) != (0, 0)
+    assert ihi - ilo <= 10 and jhi - jlo <= 5
+
+
+def test_etas_dims_unchanged():
+    olon, olat = synthetic_track()
+    _, lons, lats, etas = load_cylind([], olon, olat)
+
+    assert lons.dims == ('time', 'radi', 'azim')
+    assert etas.dims == ('azim', 'time', 'radi')
+
+
+def analytic_vortex():
+    glat = np.arange(60, -0.01, -0.25)
+    glon = np.arange(90, 160.01, 0.25)
+    LA, LO = np.meshgrid(glat, glon, indexing='ij')
+    tx, ty = np.linspace(120, 130, 10), np.linspace(20, 30, 10)
+
+    p, u, v, z = [], [], [], []
+    for x, y in zip(tx, ty):
+        dx = (LO - x) * np.cos(np.deg2rad(y))
+        dy = LA - y
+        r  = np.hypot(dx, dy)
+        vt = 40 * r * np.exp(0.5 * (1 - r**2)) / np.maximum(r, 1e-6)
+        p.append(1000 - 50 * np.exp(-r**2 / 2))
+        u.append(-vt * dy)
+        v.append( vt * dx)
+        z.append(np.exp(-r**2 / 0.5))
+
+    mk = lambda a: xr.DataArray(np.array(a), dims=('time', 'lat', 'lon'),
+                                coords={'time':times, 'lat':glat, 'lon':glon})
+
+    return mk(p), mk(u), mk(v), mk(z), tx, ty
+
+
+def test_relocate_center():
+    p, u, v, z, tx, ty = analytic_vortex()
+    olon, olat = synthetic_track()
+    olon, olat = olon + 0.6, olat - 0.5
+
+    for crit, ds in [('pressure', p), ('wind', [u, v]), ('vorticity', z)]:
+        x, y = relocate_center(ds, olon, olat, criterion=crit)
+
+        assert x.dims == ('time',)
+        assert np.abs(x.values - tx).max() < 0.15
+        assert np.abs(y.values - ty).max() < 0.15
+
+
+def test_substep_times():
+    ds = synthetic_dataset()
+    olon, olat = synthetic_track()
+
+    # at the data times, sub-step sampling equals blockwise sampling
+    a, _, _, _ = load_cylind(ds['u'], olon, olat, radMax=6, times=times)
+    b, _, _, _ = load_cylind(ds['u'], olon, olat, radMax=6, blockwise=True)
+    np.testing.assert_allclose(a.values, b.values, atol=1e-12)
+
+    # at midpoints, equals interpolating the full fields in time then in space
+    mids = times[:-1] + (times[1:] - times[:-1]) / 2
+    c, lons, lats, _ = load_cylind(ds['u'].chunk({'time':3}), olon, olat,
+                                   radMax=6, times=mids)
+    ref = ds['u'].interp(time=mids).interp(lon=lons, lat=lats)
+    np.testing.assert_allclose(c.values,
+                               ref.drop_vars(['lat', 'lon'])
+                                  .transpose(*c.dims).values, atol=1e-12)
+
+    # centers lie on the great circle between the track points
+    assert np.all(np.diff(lons.isel(radi=0, azim=0).values) > 0)
+
+
+def test_substep_times_not_increasing():
+    ds = synthetic_dataset()
+    olon, olat = synthetic_track()
+
+    with pytest.raises(Exception, match='monotonic'):
+        load_cylind(ds['u'], olon, olat, times=times[::-1][:3])
+
+
+def test_blockwise_track_subset():
+    ds = synthetic_dataset()
+    olon, olat = synthetic_track()
+    olon, olat = olon[2:7], olat[2:7]
+
+    ref, _, _, _ = load_cylind(ds['u'].sel(time=olon.time), olon, olat, radMax=6)
+    new, _, _, _ = load_cylind(ds['u'].chunk({'time':3}), olon, olat,
+                               radMax=6, blockwise=True)
+
+    assert (new.time.values == olon.time.values).all()
+    np.testing.assert_allclose(new.values, ref.values, atol=1e-12)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+"""
+import numpy as np
+import xarray as xr
+from xvortices import CylindDiags
+
+
+def solid_body(omega=1e-5, nt=3):
+    radi = np.linspace(0, 5, 21)
+    azim = np.arange(0, 360, 10.)
+    rs = 6371200.0 * np.sin(np.deg2rad(radi))
+    ut = xr.DataArray(omega * rs[None, :, None] * np.ones((nt, 1, azim.size)),
+                      dims=('time', 'radi', 'azim'),
+                      coords={'time':np.arange(nt), 'radi':radi, 'azim':azim})
+    return ut, xr.zeros_like(ut)
+
+
+def test_solid_body_rotation():
+    omega = 1e-5
+    ut, vr = solid_body(omega)
+    d = CylindDiags(ut.chunk({'radi':7}), vr.chunk({'radi':7}), olat=20.0)
+
+    ds = d.diagnose('vor', 'div', 'angm', 'I2', 'uvEddy')
+    exact = 2 * omega * np.cos(np.deg2rad(ut.radi))
+
+    np.testing.assert_allclose(ds.vor.isel(radi=slice(1, None)),
+                               exact.broadcast_like(ut).isel(radi=slice(1, None)),
+                               rtol=1e-3)
+    np.testing.assert_allclose(ds.div.isel(radi=slice(1, None)), 0, atol=1e-20)
+    np.testing.assert_allclose(ds.uvEddy, 0, atol=1e-20)
+    assert np.isnan(ds.vor.isel(radi=0)).all()
+
+
+def test_dims_order_and_cache():
+    ut, vr = solid_body()
+    olat = xr.DataArray([20.0, 21.0, 22.0], dims='time')
+    d = CylindDiags(ut, vr, olat=olat)
+
+    assert d.vor.dims == ('time', 'radi', 'azim')
+    assert d.div.dims == ('time', 'radi', 'azim')
+    assert d.angm.dims == ('time', 'radi')
+    assert d.I2.dims == ('time', 'radi')
+    assert d.uvEddy.dims == ('time', 'radi')
+    assert d.vor is d.vor
+    assert [k for k in d._cache if 'ddy' in k] == ['uvEddy']
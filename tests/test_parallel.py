@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+"""
+import dask
+import dask.array as dsa
+import numpy as np
+import pytest
+import xarray as xr
+from xvortices import map_cylind
+
+
+def make_result(k):
+    da = xr.DataArray(np.full((3, 4), float(k)), dims=('radi', 'azim'),
+                      coords={'radi':[0, 1, 2]}, name='ut', attrs={'k':k})
+    return [da, xr.Dataset({'vr':da * 2}, attrs={'k':k}), np.arange(k + 1)]
+
+
+def fail_on_three(k):
+    if k == 3:
+        raise ValueError('bad item')
+    return make_result(k)
+
+
+@dask.delayed
+def broken():
+    raise ValueError('bad chunk')
+
+
+def fail_in_share(k):
+    bad = xr.DataArray(dsa.from_delayed(broken(), shape=(2,), dtype=float),
+                       dims='radi')
+    return [np.ones(10), bad]
+
+
+def test_round_trip(tmp_path):
+    res = map_cylind(make_result, range(4), processes=2, tmpdir=str(tmp_path),
+                     context='spawn')
+
+    for k, (da, ds, arr) in enumerate(res):
+        assert da.identical(make_result(k)[0])
+        assert ds.identical(make_result(k)[1])
+        np.testing.assert_array_equal(arr, np.arange(k + 1))
+        assert isinstance(da.data, np.memmap)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cleanup_on_task_error(tmp_path):
+    with pytest.raises(ValueError, match='bad item'):
+        map_cylind(fail_on_three, range(8), processes=2, tmpdir=str(tmp_path),
+                   context='spawn')
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cleanup_on_share_error(tmp_path):
+    with pytest.raises(ValueError, match='bad chunk'):
+        map_cylind(fail_in_share, range(2), processes=2, tmpdir=str(tmp_path),
+                   context='spawn')
+
+    assert list(tmp_path.iterdir()) == []
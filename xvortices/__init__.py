@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
-from .core import load_cylind, project_to_cylind, storm_relative
+from .core import load_cylind, project_to_cylind, storm_relative, \
+                   relocate_center
+from .composite import Composite
+from .diagnostics import CylindDiags
+from .parallel import map_cylind
 from .utils import plot3D
 
 
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+'''
+import numpy as np
+import xarray as xr
+
+
+'''
+Here defines a streaming accumulator for storm-centred composites
+'''
+class Composite(object):
+    """Streaming composite of cylindrical fields
+
+    Accumulate running count, mean and variance (Welford/Chan updates) of
+    cylindrical fields, e.g., from `load_cylind`, over many storms and
+    times, optionally binned by a label such as intensity or motion
+    direction.  Fields are fed chunk by chunk so the whole sample never
+    needs to be held in memory, and partial composites from parallel
+    workers can be combined with `merge`.
+
+    Parameters
+    ----------
+    dim: str
+        Sample dimension to be reduced (usually time)
+    bins: numpy.array
+        Bin edges applied to the labels passed to `add`.  If None, the
+        labels themselves are used as the bins.
+    hist_range: tuple of float
+        (min, max) of a fixed histogram kept for each grid point and bin,
+        used to estimate quantiles.  If None, no quantile sketch is kept.
+        Samples outside the range are counted separately (see `outside`)
+        rather than clipped into the edge bins.
+    hist_bins: int
+        Number of histogram bins for the quantile sketch
+    """
+    def __init__(self, dim='time', bins=None, hist_range=None, hist_bins=100):
+        self.dim = dim
+        self.bins = None if bins is None else np.asarray(bins)
+        self.hist_range = hist_range
+        self.hist_bins = hist_bins
+        self.template = None
+        self.stats = {} # bin label -> [count, mean, M2, hist]
+
+    def add(self, da, by=None):
+        """Add a chunk of samples
+
+        Parameters
+        ----------
+        da: xarray.DataArray
+            Cylindrical field containing the sample dimension
+        by: scalar, numpy.array, or xarray.DataArray
+            Bin label of the whole chunk (scalar) or of each sample along
+            the sample dimension.  None puts all samples into a single bin.
+        """
+        if self.dim not in da.dims:
+            da = da.expand_dims(self.dim)
+
+        da = da.transpose(self.dim, ...)
+        self._check_template(da)
+
+        ns = da.sizes[self.dim]
+        labels = self._labels(by, ns)
+        self._check_labels(labels[labels != None])
+        values = np.asarray(da.values, dtype=float)
+
+        for label in np.unique(labels[labels != None]):
+            self._update(label, values[labels == label])
+
+    def merge(self, other):
+        """Merge another composite (e.g., from a parallel worker) into this
+
+        Parameters
+        ----------
+        other: Composite
+            A partial composite with the same settings and field shape
+        """
+        if other.template is None:
+            return self
+
+        same_bins = (self.bins is None and other.bins is None) or \
+                    (self.bins is not None and other.bins is not None and
+                     np.array_equal(self.bins, other.bins))
+
+        if (self.dim != other.dim or self.hist_range != other.hist_range
+            or self.hist_bins != other.hist_bins or not same_bins):
+            raise Exception('composites with different settings cannot be merged')
+
+        if self.template is None:
+            self.template = other.template
+        elif self.template.shape != other.template.shape:
+            raise Exception('composites of different shapes cannot be merged')
+
+        self._check_labels(list(other.stats.keys()))
+
+        for label, st in other.stats.items():
+            self._combine(label, *st)
+
+        return self
+
+    def count(self):
+        """Number of valid samples in each bin at each grid point"""
+        return self._to_xarray(lambda st: st[0], 'count')
+
+    def mean(self):
+        """Composite mean in each bin"""
+        return self._to_xarray(lambda st: _masked(st[1], st[0] > 0), 'mean')
+
+    def var(self, ddof=0):
+        """Composite variance in each bin
+
+        Parameters
+        ----------
+        ddof: int
+            Delta degrees of freedom
+        """
+        def func(st):
+            n = st[0] - ddof
+            return _masked(st[2] / np.where(n > 0, n, 1), n > 0)
+
+        return self._to_xarray(func, 'var')
+
+    def std(self, ddof=0):
+        """Composite standard deviation in each bin
+
+        Parameters
+        ----------
+        ddof: int
+            Delta degrees of freedom
+        """
+        return np.sqrt(self.var(ddof=ddof)).rename('std')
+
+    def quantile(self, q):
+        """Quantile estimated from the histogram sketch
+
+        Parameters
+        ----------
+        q: float
+            Quantile within 0 ~ 1
+
+        Return
+        ----------
+        re: xarray.DataArray
+            Estimated quantile in each bin, with a resolution of the
+            histogram bin width.  NaN where the quantile falls among the
+            samples outside hist_range.
+        """
+        if self.hist_range is None:
+            raise Exception('hist_range is not set, no quantile sketch is kept')
+
+        edges = np.linspace(*self.hist_range, self.hist_bins + 1)
+
+        def func(st):
+            hist = st[3]
+            cdf = np.cumsum(hist, axis=0)
+            tot = cdf[-1]
+            tgt = q * tot
+            # hist[0] and hist[-1] count the samples below/above hist_range
+            idx = np.where(tgt > 0, (cdf < tgt[None]).sum(axis=0),
+                           np.argmax(hist > 0, axis=0))
+            inside = (idx > 0) & (idx <= self.hist_bins)
+            idx = np.clip(idx, 1, self.hist_bins)
+            lo  = np.take_along_axis(cdf, (idx - 1)[None], 0)[0]
+            cnt = np.take_along_axis(hist, idx[None], 0)[0]
+            frac = (tgt - lo) / np.where(cnt > 0, cnt, 1)
+            re = edges[idx - 1] + np.clip(frac, 0, 1) * (edges[1] - edges[0])
+            return _masked(re, (tot > 0) & inside)
+
+        return self._to_xarray(func, 'quantile')
+
+    def outside(self):
+        """Number of valid samples outside hist_range in each bin"""
+        if self.hist_range is None:
+            raise Exception('hist_range is not set, no quantile sketch is kept')
+
+        return self._to_xarray(lambda st: st[3][0] + st[3][-1], 'outside')
+
+
+    '''
+    Below are the private helper methods
+    '''
+    def _check_template(self, da):
+        sample = da.isel({self.dim: 0}, drop=True)
+
+        if self.template is None:
+            self.template = xr.zeros_like(sample, dtype=float).load()
+        elif sample.shape != self.template.shape:
+            raise Exception('shape ' + str(sample.shape) + ' does not match '
+                            'the composite shape ' + str(self.template.shape))
+
+    def _labels(self, by, ns):
+        if by is None:
+            labels = np.zeros(ns, dtype=object)
+        else:
+            labels = np.asarray(getattr(by, 'values', by))
+            labels = np.broadcast_to(labels, (ns,))
+
+            if self.bins is not None:
+                idx = np.digitize(labels.astype(float), self.bins) - 1
+                inside = (idx >= 0) & (idx < len(self.bins) - 1)
+                labels = np.where(inside, idx, None)
+
+            labels = labels.astype(object)
+
+        return labels
+
+    def _check_labels(self, labels):
+        kinds = {_label_kind(l) for l in labels} | \
+                {_label_kind(l) for l in self.stats.keys()}
+
+        if len(kinds) > 1:
+            raise Exception('labels of mixed types ' + str(sorted(kinds)) +
+                            ' cannot be binned together')
+
+    def _update(self, label, values):
+        valid = np.isfinite(values)
+        n     = valid.sum(axis=0).astype(float)
+        vals  = np.where(valid, values, 0)
+        mean  = vals.sum(axis=0) / np.where(n > 0, n, 1)
+        M2    = (np.where(valid, values - mean, 0) ** 2).sum(axis=0)
+
+        hist = None
+        if self.hist_range is not None:
+            lo, hi = self.hist_range
+            # bins 1 ~ hist_bins cover [lo, hi], 0 and hist_bins+1 the outside
+            idx = np.floor((values - lo) / (hi - lo) * self.hist_bins) + 1
+            idx = np.where(values == hi, self.hist_bins, idx)
+            idx = np.clip(np.nan_to_num(idx), 0, self.hist_bins + 1).astype(int)
+            # one bincount over (bin, grid point) pairs flattened together
+            npts = int(np.prod(values.shape[1:]))
+            flat = idx.reshape((-1, npts)) * npts + np.arange(npts)
+            hist = np.bincount(flat.ravel(), weights=valid.ravel(),
+                               minlength=(self.hist_bins + 2) * npts)
+            hist = hist.reshape((self.hist_bins + 2,) + values.shape[1:])
+
+        self._combine(label, n, mean, M2, hist)
+
+    def _combine(self, label, n, mean, M2, hist):
+        if label not in self.stats:
+            self.stats[label] = [n.copy(), mean.copy(), M2.copy(),
+                                 None if hist is None else hist.copy()]
+            return
+
+        st = self.stats[label]
+        na, ma, Ma = st[0], st[1], st[2]
+        nt = na + n
+        d  = mean - ma
+        w  = n / np.where(nt > 0, nt, 1)
+
+        st[0] = nt
+        st[1] = ma + d * w
+        st[2] = Ma + M2 + d ** 2 * na * w
+        if hist is not None:
+            st[3] = st[3] + hist
+
+    def _to_xarray(self, func, name):
+        if self.template is None:
+            raise Exception('no data have been added')
+
+        labels = sorted(self.stats.keys())
+        if self.bins is not None:
+            coord = [(self.bins[l] + self.bins[l+1]) / 2.0 for l in labels]
+        else:
+            coord = labels
+
+        re = [self.template.copy(data=func(self.stats[l])) for l in labels]
+
+        return xr.concat(re, dim='bin').assign_coords(bin=coord).rename(name)
+
+
+def _masked(values, cond):
+    return np.where(cond, values, np.nan)
+
+
+def _label_kind(label):
+    if isinstance(label, (int, float, np.number)):
+        return 'number'
+
+    return type(label).__name__
+
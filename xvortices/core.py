@@ -14,7 +14,7 @@ from numpy import deg2rad, sin, cos, arcsin, arccos, arctan2, hypot
 Here defines the core function of the data interpolation
 '''
 def load_cylind(ds, olon, olat, azimNum=36, radiNum=11, radMax=10,
-                lonname='lon', latname='lat'):
+                lonname='lon', latname='lat', blockwise=False, times=None):
     """Load binary data
 
     Load scalar data from a lat/lon grid to a cylindrical grid translating
@@ -38,6 +38,20 @@ def load_cylind(ds, olon, olat, azimNum=36, radiNum=11, radMax=10,
         Name of longitude in ds
     latname: str
         Name of latitude in ds
+    blockwise: bool
+        Sample the data block by block along the track dimension (usually
+        time) using bilinear weights instead of xarray's interp.  For
+        dask-backed data, each time chunk only reads the local lat/lon
+        window covered by the cylinders, so that the graph size scales with
+        the number of time chunks.  The returned lons/lats are chunked to
+        match the data.
+    times: numpy.array or xarray.DataArray
+        Monotonic increasing target coordinates of the track dimension
+        (usually time), e.g., finer than those of the data.  The centers
+        are interpolated along the great circle, and the data are sampled
+        blockwise at the two bracketing steps with the same spatial weights
+        and blended linearly in time, so full fields are never interpolated
+        in time.
 
     Return
     ----------
@@ -50,38 +64,36 @@ def load_cylind(ds, olon, olat, azimNum=36, radiNum=11, radMax=10,
     etas_r: xarray.DataArray
         Local angle between radial direction and local north (radian)
     """
-    azim = xr.DataArray(np.linspace(0, 360-360/azimNum, azimNum),
-                        dims='azim',
-                        coords={'azim':np.linspace(0, 360-360/azimNum, azimNum)})
-    radi = xr.DataArray(np.linspace(0, radMax, radiNum),
-                        dims='radi',
-                        coords={'radi':np.linspace(0, radMax, radiNum)})
-    
-    olon_r = deg2rad(olon)
-    olat_r = deg2rad(olat)
-    azim_r = deg2rad(azim)
-    radi_r = deg2rad(radi)
-    
-    lats_r = arcsin(sin(olat_r)*cos(radi_r) + cos(olat_r)*sin(radi_r)*cos(azim_r))
-    dlam_r = 1.0/cos(lats_r) * arcsin(sin(radi_r)*sin(azim_r))
-    lons_r = olon_r - dlam_r
-    etas_r = arccos(sin(olat_r)*sin(dlam_r)*sin(azim_r) - cos(dlam_r)*cos(azim_r))
+    if times is not None:
+        if np.any(np.diff(_as_float(getattr(times, 'values', times))) < 0):
+            raise Exception('target times should be monotonic increasing')
+        
+        olon, olat = _interp_track(olon, olat, times)
     
-    etas_r = xr.where(etas_r.azim<180, -etas_r+np.pi, etas_r+np.pi)
+    lons, lats, etas_r = _cylind_geometry(olon, olat, azimNum, radiNum, radMax)
     
-    lats = np.rad2deg(lats_r)
-    lons = np.rad2deg(lons_r)
-    # etas = np.rad2deg(etas_r)
+    if times is not None:
+        sample = lambda v: _sample_blocks(v, lons, lats, lonname, latname,
+                                          substep=True)
+    elif blockwise:
+        sample = lambda v: _sample_blocks(v, lons, lats, lonname, latname)
+    else:
+        sample = lambda v: v.interp(coords={lonname:lons, latname:lats}
+                                    ).drop_vars([latname,lonname])
     
     if type(ds) in [list, np.ndarray, np.array]:
-        vs_interp = [v.interp(coords={lonname:lons, latname:lats}
-                              ).drop_vars([latname,lonname]) for v in ds]
+        vs_interp = [sample(v) for v in ds]
     elif type(ds) in [xr.Dataset]:
-        vs_interp = [ds[v].interp(coords={lonname:lons, latname:lats}
-                              ).drop_vars([latname,lonname]) for v in ds.data_vars]
+        vs_interp = [sample(ds[v]) for v in ds.data_vars]
     else:
-        vs_interp = ds.interp(coords={lonname:lons, latname:lats}
-                              ).drop_vars([latname,lonname])
+        vs_interp = sample(ds)
+    
+    if blockwise or times is not None:
+        ref = vs_interp[0] if type(vs_interp) == list and len(vs_interp) \
+              else vs_interp
+        
+        if isinstance(ref, xr.DataArray):
+            lons, lats, etas_r = [_chunk_like(g, ref) for g in (lons, lats, etas_r)]
     
     return vs_interp, lons, lats, etas_r
 
@@ -108,8 +120,7 @@ def project_to_cylind(u, v, etas):
     vra: xarray.DataArray
         radial component of velocity
     """
-    uaz = -u*cos(etas) - v*sin(etas) # azimuth component
-    vra = -u*sin(etas) + v*cos(etas) # radial  component
+    uaz, vra = _project(u, v, etas)
     
     return uaz.rename('ut'), vra.rename('vr')
 
@@ -151,3 +162,655 @@ def storm_relative(uc, vc, uaz, vra):
     
     return uaz_rel, vra_rel
 
+
+def relocate_center(ds, olon, olat, criterion='pressure', radMax=1.0, niter=6,
+                    azimNum=16, radiNum=5, windRad=3.0, lonname='lon',
+                    latname='lat'):
+    """Refine the vortex center
+
+    Iteratively re-center the cylindrical coordinate on the vortex, starting
+    from a first-guess (e.g., best-track) center.  At each iteration, a small
+    cylinder of candidate centers within the search radius is sampled from a
+    lat/lon window around the first guess, the center is moved according to
+    the criterion, and the search radius is halved.
+
+    Parameters
+    ----------
+    ds: xarray.DataArray or list of xarray.DataArray
+        A 2D (per track step) lat/lon grid variable: pressure for 'pressure',
+        relative vorticity for 'vorticity', or a list of [u, v] for 'wind'
+    olon: float or xarray.DataArray
+        First-guess central longitude along the track, in degree
+    olat: float or xarray.DataArray
+        First-guess central latitude along the track, in degree
+    criterion: str
+        One of ['pressure', 'wind', 'vorticity'], re-centering on the minimum
+        pressure, the maximum azimuthal-mean tangential wind, or the centroid
+        of the cyclonic vorticity
+    radMax: float
+        Initial search radius in degree
+    niter: int
+        Maximum number of iterations
+    azimNum: int
+        Number of azimuthal grid points of the small cylinders
+    radiNum: int
+        Number of radial grid points of the small cylinders
+    windRad: float
+        Radius (degree) of the cylinder used to evaluate the azimuthal-mean
+        tangential wind for 'wind'
+    lonname: str
+        Name of longitude in ds
+    latname: str
+        Name of latitude in ds
+
+    Return
+    ----------
+    olon_new: xarray.DataArray
+        Refined central longitude (degree)
+    olat_new: xarray.DataArray
+        Refined central latitude (degree)
+    """
+    if criterion not in ['pressure', 'wind', 'vorticity']:
+        raise Exception('unsupported criterion: ' + str(criterion))
+    
+    vs = list(ds) if criterion == 'wind' else [ds]
+    
+    olon = xr.DataArray(olon)
+    olat = xr.DataArray(olat)
+    tdim = olon.dims[0] if olon.ndim == 1 else None
+    
+    if olon.ndim > 1:
+        raise Exception('only 1D track is supported')
+    
+    margin = radMax * 2 + (windRad if criterion == 'wind' else radMax)
+    lonc, latc = [], []
+    
+    for k in range(olon.size):
+        ox, oy = float(olon.values.ravel()[k]), float(olat.values.ravel()[k])
+        
+        fields = [v.sel({tdim: olon[tdim][k]}) if tdim is not None and tdim in v.dims
+                  else v for v in vs]
+        
+        # only the local window around the first guess is loaded
+        win = [_local_window(f, ox, oy, margin, lonname, latname) for f in fields]
+        wlon, wlat = win[0][lonname].values, win[0][latname].values
+        data = [w.values[None] for w in win]
+        
+        rad = radMax
+        for i in range(niter):
+            ox, oy = _recenter(data, wlon, wlat, ox, oy, rad, criterion,
+                               azimNum, radiNum, windRad)
+            rad /= 2.0
+        
+        lonc.append(ox)
+        latc.append(oy)
+    
+    olon_new = olon.copy(data=np.reshape(lonc, olon.shape))
+    olat_new = olat.copy(data=np.reshape(latc, olat.shape))
+    
+    return olon_new, olat_new
+
+
+"""
+Below are the private helper methods
+"""
+def _cylind_geometry(olon, olat, azimNum, radiNum, radMax):
+    """Cylindrical grid geometry
+
+    Calculate the lat/lon positions of the cylindrical grid points and the
+    local angle between radial direction and local north.
+
+    Parameters
+    ----------
+    olon: (list of) float, numpy.array, or xarray.DataArray
+        Central longitude of the cylindrical coordinate, in degree
+    olat: (list of) float, numpy.array, or xarray.DataArray
+        Central latitude of the cylindrical coordinate, in degree
+    azimNum: int
+        Number of azimuthal grid points
+    radiNum: int
+        Number of radial grid points
+    radMax: float
+        Maximum radius in degree
+
+    Return
+    ----------
+    lons: xarray.DataArray
+        Longitudes for cylindrical coordinates (degree)
+    lats: xarray.DataArray
+        latitudes for cylindrical coordinates (degree)
+    etas_r: xarray.DataArray
+        Local angle between radial direction and local north (radian)
+    """
+    azim = xr.DataArray(np.linspace(0, 360-360/azimNum, azimNum),
+                        dims='azim',
+                        coords={'azim':np.linspace(0, 360-360/azimNum, azimNum)})
+    radi = xr.DataArray(np.linspace(0, radMax, radiNum),
+                        dims='radi',
+                        coords={'radi':np.linspace(0, radMax, radiNum)})
+    
+    lons, lats, etas_r = _cylind_points(olon, olat, azim, radi)
+    
+    # keep the dimension order of etas as from xr.where(etas.azim<180, ...)
+    etas_r = etas_r.transpose('azim', ...)
+    
+    return lons, lats, etas_r
+
+
+def _cylind_points(olon, olat, azim, radi):
+    """Cylindrical grid positions for broadcastable numpy or xarray inputs.
+
+    All inputs are in degree.  Returns lons, lats (degree) and etas (radian).
+    """
+    olon_r = deg2rad(olon)
+    olat_r = deg2rad(olat)
+    azim_r = deg2rad(azim)
+    radi_r = deg2rad(radi)
+    
+    lats_r = arcsin(sin(olat_r)*cos(radi_r) + cos(olat_r)*sin(radi_r)*cos(azim_r))
+    dlam_r = 1.0/cos(lats_r) * arcsin(sin(radi_r)*sin(azim_r))
+    lons_r = olon_r - dlam_r
+    etas_r = arccos(sin(olat_r)*sin(dlam_r)*sin(azim_r) - cos(dlam_r)*cos(azim_r))
+    
+    # -etas+pi for azim < 180 and etas+pi otherwise
+    etas_r = np.pi + etas_r * ((azim >= 180) * 2 - 1)
+    
+    lats = np.rad2deg(lats_r)
+    lons = np.rad2deg(lons_r)
+    # etas = np.rad2deg(etas_r)
+    
+    return lons, lats, etas_r
+
+
+def _project(u, v, etas):
+    """Azimuthal/radial components for numpy or xarray inputs."""
+    uaz = -u*cos(etas) - v*sin(etas) # azimuth component
+    vra = -u*sin(etas) + v*cos(etas) # radial  component
+    
+    return uaz, vra
+
+
+def _track_dim(lons):
+    """Return the track dimension (usually time) of the geometry, or None."""
+    tdims = [d for d in lons.dims if d not in ('radi', 'azim')]
+    
+    if len(tdims) > 1:
+        raise Exception('only one track dimension is supported, got ' +
+                        str(tdims))
+    
+    return tdims[0] if tdims else None
+
+
+def _chunk_like(geom, ref):
+    """Chunk the geometry along the track dimension to match ref."""
+    tdim = _track_dim(geom)
+    
+    if (tdim is None or ref.chunks is None or tdim not in ref.dims
+        or geom.sizes[tdim] != ref.sizes[tdim]):
+        return geom
+    
+    return geom.chunk({tdim: ref.chunksizes[tdim]})
+
+
+def _bilinear_index(coord, pts):
+    """Fractional-index weights of points along a 1D coordinate
+
+    Parameters
+    ----------
+    coord: numpy.array
+        A monotonic (ascending or descending) 1D coordinate
+    pts: numpy.array
+        Positions to be located along the coordinate
+
+    Return
+    ----------
+    i0: numpy.array
+        Index of the lower bracketing grid point
+    w: numpy.array
+        Weight of the upper bracketing grid point, NaN if out of range
+    """
+    coord = np.asarray(coord, dtype=float)
+    n = coord.size
+    
+    if coord[0] > coord[-1]:
+        idx = np.interp(pts, coord[::-1], np.arange(n-1, -1, -1, dtype=float),
+                        left=np.nan, right=np.nan)
+    else:
+        idx = np.interp(pts, coord, np.arange(n, dtype=float),
+                        left=np.nan, right=np.nan)
+    
+    i0 = np.clip(np.floor(np.nan_to_num(idx)), 0, max(n-2, 0)).astype(int)
+    
+    return i0, idx - i0
+
+
+def _bilinear_weights(lon, lat, xs, ys):
+    """Bilinear interpolation weights on a lat/lon grid
+
+    Parameters
+    ----------
+    lon: numpy.array
+        1D longitude of the source grid
+    lat: numpy.array
+        1D latitude of the source grid
+    xs: numpy.array
+        Longitudes of the sampling points
+    ys: numpy.array
+        Latitudes of the sampling points
+
+    Return
+    ----------
+    weights: tuple of numpy.array
+        (j0, i0, wy, wx) with the same shape as xs
+    """
+    i0, wx = _bilinear_index(lon, xs)
+    j0, wy = _bilinear_index(lat, ys)
+    
+    return j0, i0, wy, wx
+
+
+def _block_window(j0, i0, wy, wx, ny, nx):
+    """Local lat/lon window covering the bilinear stencils of given weights
+
+    Points outside the domain (NaN weights) do not enlarge the window.
+
+    Return
+    ----------
+    window: tuple of int
+        (jlo, jhi, ilo, ihi) as slice bounds of the lat/lon dimensions
+    """
+    ok = np.isfinite(wy) & np.isfinite(wx)
+    jv, iv = (j0[ok], i0[ok]) if ok.any() else (np.zeros(1, int),) * 2
+    
+    # one extra point for the stencil
+    return (jv.min(), min(jv.max() + 2, ny), iv.min(), min(iv.max() + 2, nx))
+
+
+def _bilinear_apply(data, j0, i0, wy, wx, rows=None):
+    """Apply the bilinear weights
+
+    Parameters
+    ----------
+    data: numpy.array
+        Source data in the shape of (ns, ..., ny, nx)
+    j0, i0, wy, wx: numpy.array
+        Weights from `_bilinear_weights` in the shape of (nt, ...) or
+        (1, ...) if the sampling points are shared by all nt = ns
+    rows: numpy.array
+        Indices of the source steps for each of the nt steps.  If None,
+        the nt steps are the ns source steps.  Only the stencil points are
+        gathered, the source steps are never replicated.
+
+    Return
+    ----------
+    re: numpy.array
+        Sampled data in the shape of (nt,) + data.shape[1:-2] + j0.shape[1:]
+    """
+    ny, nx = data.shape[-2], data.shape[-1]
+    mid = data.shape[1:-2]
+    pts = j0.shape[1:]
+    
+    data = data.reshape((data.shape[0], -1, ny, nx))
+    j0, i0, wy, wx = [w.reshape((w.shape[0], -1, 1)) for w in (j0, i0, wy, wx)]
+    j1 = np.minimum(j0 + 1, ny - 1)
+    i1 = np.minimum(i0 + 1, nx - 1)
+    
+    if rows is not None:
+        nt, tt = len(rows), np.asarray(rows)[:, None]
+    else:
+        nt, tt = data.shape[0], np.arange(data.shape[0])[:, None]
+        tt = tt if j0.shape[0] != 1 else 0
+    
+    # advanced indices separated by a slice put the point axis first
+    re = ((1-wy) * (1-wx) * data[tt, :, j0[..., 0], i0[..., 0]] +
+          (1-wy) *    wx  * data[tt, :, j0[..., 0], i1[..., 0]] +
+             wy  * (1-wx) * data[tt, :, j1[..., 0], i0[..., 0]] +
+             wy  *    wx  * data[tt, :, j1[..., 0], i1[..., 0]])
+    
+    return np.moveaxis(re, -1, 1).reshape((nt,) + mid + pts)
+
+
+def _bilinear_blend(data, r0, r1, alpha, j0, i0, wy, wx):
+    """Apply the bilinear weights and blend two source steps linearly
+
+    Parameters
+    ----------
+    data: numpy.array
+        Source data in the shape of (ns, ..., ny, nx)
+    r0, r1: numpy.array
+        Indices of the two bracketing source steps for each of the nt steps
+    alpha: numpy.array
+        Weights of the r1 steps
+    j0, i0, wy, wx: numpy.array
+        Weights from `_bilinear_weights` in the shape of (nt, ...)
+
+    Return
+    ----------
+    re: numpy.array
+        Sampled data in the shape of (nt,) + data.shape[1:-2] + j0.shape[1:]
+    """
+    s0 = _bilinear_apply(data, j0, i0, wy, wx, rows=r0)
+    s1 = _bilinear_apply(data, j0, i0, wy, wx, rows=r1)
+    alpha = alpha.reshape((-1,) + (1,) * (s0.ndim - 1))
+    
+    return (1.0 - alpha) * s0 + alpha * s1
+
+
+def _as_float(t):
+    """Convert (datetime) coordinate values to float for interpolation."""
+    t = np.asarray(t)
+    
+    if np.issubdtype(t.dtype, np.datetime64):
+        return t.astype('datetime64[ns]').astype('int64').astype(float)
+    
+    return t.astype(float)
+
+
+def _time_weights(src, tgt):
+    """Lower bracketing indices in src and linear weights of tgt points."""
+    src, tgt = _as_float(src), _as_float(tgt)
+    
+    if tgt.min() < src.min() or tgt.max() > src.max():
+        raise Exception('target times are out of the range of the data')
+    
+    idx = np.interp(tgt, src, np.arange(src.size, dtype=float))
+    r0 = np.clip(np.floor(idx), 0, max(src.size-2, 0)).astype(int)
+    
+    return r0, idx - r0
+
+
+def _interp_track(olon, olat, times):
+    """Interpolate the track centers to target times along the great circle
+
+    Parameters
+    ----------
+    olon: xarray.DataArray
+        Central longitude along the track dimension, in degree
+    olat: xarray.DataArray
+        Central latitude along the track dimension, in degree
+    times: numpy.array or xarray.DataArray
+        Target coordinates of the track dimension
+
+    Return
+    ----------
+    olon_i: xarray.DataArray
+        Interpolated central longitude, in degree
+    olat_i: xarray.DataArray
+        Interpolated central latitude, in degree
+    """
+    if not isinstance(olon, xr.DataArray) or olon.ndim != 1:
+        raise Exception('olon/olat should be 1D xarray.DataArray along the track')
+    
+    tdim  = olon.dims[0]
+    times = getattr(times, 'values', times)
+    r0, a = _time_weights(olon[tdim].values, times)
+    r1    = np.minimum(r0 + 1, olon.size - 1)
+    
+    lam, phi = deg2rad(olon.values), deg2rad(olat.values)
+    xyz = np.stack([cos(phi)*cos(lam), cos(phi)*sin(lam), sin(phi)], axis=-1)
+    p0, p1 = xyz[r0], xyz[r1]
+    
+    # spherical linear interpolation of unit vectors
+    omg = arccos(np.clip((p0 * p1).sum(-1), -1.0, 1.0))
+    som = sin(omg)
+    w0 = np.where(som > 1e-12, sin((1-a)*omg) / np.where(som > 1e-12, som, 1), 1-a)
+    w1 = np.where(som > 1e-12, sin(   a *omg) / np.where(som > 1e-12, som, 1),   a)
+    p  = w0[:, None] * p0 + w1[:, None] * p1
+    
+    lon_i = np.rad2deg(arctan2(p[:, 1], p[:, 0]))
+    lat_i = np.rad2deg(arctan2(p[:, 2], hypot(p[:, 0], p[:, 1])))
+    
+    # keep the longitude convention (e.g. 0~360) of the input track
+    lon_i = olon.values[r0] + (lon_i - olon.values[r0] + 180.0) % 360.0 - 180.0
+    
+    coords = {tdim: times}
+    
+    return (xr.DataArray(lon_i, dims=tdim, coords=coords, name=olon.name),
+            xr.DataArray(lat_i, dims=tdim, coords=coords, name=olat.name))
+
+
+def _sample_blocks(v, lons, lats, lonname, latname, substep=False):
+    """Sample a variable onto the cylindrical grid block by block
+
+    Each block along the track dimension only touches the lat/lon window
+    covered by its cylinders, and dask-backed data are mapped with
+    `map_blocks` so that the graph size is O(number of track chunks).
+
+    Parameters
+    ----------
+    v: xarray.DataArray
+        A given lat/lon grid variable
+    lons: xarray.DataArray
+        Longitudes for cylindrical coordinates (degree)
+    lats: xarray.DataArray
+        latitudes for cylindrical coordinates (degree)
+    lonname: str
+        Name of longitude in v
+    latname: str
+        Name of latitude in v
+    substep: bool
+        The track coordinates of lons/lats lie between those of v.  The two
+        bracketing steps of v are sampled with the same spatial weights and
+        blended linearly in time at the sampled points only.
+
+    Return
+    ----------
+    re: xarray.DataArray
+        Interpolated variable
+    """
+    tdim = _track_dim(lons)
+    
+    if tdim is not None:
+        if tdim not in v.dims:
+            raise Exception('track dimension ' + tdim + ' not found in ' +
+                            str(v.name))
+        if not substep:
+            v, lons, lats, tpos = _track_positions(v, lons, lats, tdim)
+    elif substep:
+        raise Exception('a track dimension is required for sub-step sampling')
+    
+    others = [d for d in v.dims if d not in (tdim, latname, lonname)]
+    lead   = [tdim] if tdim else []
+    
+    v    = v.transpose(*(lead + others + [latname, lonname]))
+    xs   = lons.transpose(*(lead + ['radi', 'azim'])).values
+    ys   = lats.transpose(*(lead + ['radi', 'azim'])).values
+    data = v.data
+    
+    if tdim is None:
+        xs, ys, data = xs[None], ys[None], data[None]
+    
+    j0, i0, wy, wx = _bilinear_weights(v[lonname].values, v[latname].values,
+                                       xs, ys)
+    
+    isdask = not isinstance(data, np.ndarray) and hasattr(data, 'dask')
+    tchunks = data.chunks[0] if isdask else (data.shape[0],)
+    nr, na = xs.shape[1:]
+    
+    # source steps (r0, r1) and time weights of each track step
+    if substep:
+        r0, alpha = _time_weights(v[tdim].values, lons[tdim].values)
+    elif tdim is not None:
+        r0, alpha = tpos, None
+    else:
+        r0, alpha = np.arange(1), None
+    
+    r1 = np.minimum(r0 + 1, data.shape[0] - 1) if substep else r0
+    
+    # track blocks follow the chunks of the source steps
+    bounds = np.searchsorted(r0, np.cumsum((0,) + tuple(tchunks)))
+    
+    blocks = []
+    for s, e in zip(bounds[:-1], bounds[1:]):
+        if s == e:
+            continue
+        
+        jb, ib, wyb, wxb = j0[s:e], i0[s:e], wy[s:e], wx[s:e]
+        
+        jlo, jhi, ilo, ihi = _block_window(jb, ib, wyb, wxb, data.shape[-2],
+                                           data.shape[-1])
+        tlo, thi = r0[s], r1[e-1] + 1
+        
+        sub = data[tlo:thi, ..., jlo:jhi, ilo:ihi]
+        
+        # points outside the domain carry NaN weights, any index in the window
+        jb = np.clip(jb - jlo, 0, jhi - jlo - 1)
+        ib = np.clip(ib - ilo, 0, ihi - ilo - 1)
+        
+        if substep:
+            func = _bilinear_blend
+            args = (r0[s:e] - tlo, r1[s:e] - tlo, alpha[s:e], jb, ib, wyb, wxb)
+        else:
+            func = _bilinear_apply
+            args = (jb, ib, wyb, wxb, r0[s:e] - tlo)
+        
+        if isdask:
+            sub = sub.rechunk({0: -1, sub.ndim-2: -1, sub.ndim-1: -1})
+            blk = sub.map_blocks(func, *args,
+                                 chunks=((e-s,),) + sub.chunks[1:-2] +
+                                        ((nr,), (na,)),
+                                 dtype=np.result_type(sub.dtype, float))
+        else:
+            blk = func(np.asarray(sub), *args)
+        
+        blocks.append(blk)
+    
+    if isdask:
+        import dask.array as dsa
+        re = dsa.concatenate(blocks, axis=0)
+    else:
+        re = np.concatenate(blocks, axis=0)
+    
+    if tdim is None:
+        re = re[0]
+    
+    coords = {k: c for k, c in v.coords.items()
+              if k not in (latname, lonname)
+              and latname not in c.dims and lonname not in c.dims
+              and (not substep or tdim not in c.dims)}
+    coords['radi'] = lons['radi']
+    coords['azim'] = lons['azim']
+    
+    if tdim is not None:
+        # coordinates along the track follow the sampled source steps
+        for k, c in coords.items():
+            if tdim in c.dims and not substep:
+                coords[k] = c.isel({tdim: tpos}).drop_vars(tdim, errors='ignore')
+        coords[tdim] = lons[tdim]
+    
+    return xr.DataArray(re, dims=lead + others + ['radi', 'azim'],
+                        coords=coords, name=v.name, attrs=v.attrs)
+
+
+def _track_positions(v, lons, lats, tdim):
+    """Positions of the track steps in v (inner join) without reindexing v
+
+    Return
+    ----------
+    v, lons, lats: xarray.DataArray
+        v is untouched unless its track index is not unique or the matched
+        positions are not increasing, where it falls back to xr.align
+    tpos: numpy.array
+        Positions along tdim of v for each track step of lons/lats
+    """
+    if tdim not in v.indexes or tdim not in lons.indexes:
+        if v.sizes[tdim] != lons.sizes[tdim]:
+            raise Exception('track dimension ' + tdim + ' has different sizes')
+        return v, lons, lats, np.arange(lons.sizes[tdim])
+    
+    vidx, gidx = v.indexes[tdim], lons.indexes[tdim]
+    
+    if vidx.equals(gidx):
+        return v, lons, lats, np.arange(lons.sizes[tdim])
+    
+    if vidx.is_unique:
+        tpos = vidx.get_indexer(gidx)
+        keep = tpos >= 0
+        tpos = tpos[keep]
+        
+        if np.all(np.diff(tpos) >= 0):
+            return (v, lons.isel({tdim: keep}), lats.isel({tdim: keep}), tpos)
+    
+    v, lons, lats = xr.align(v, lons, lats, join='inner')
+    
+    return v, lons, lats, np.arange(lons.sizes[tdim])
+
+
+def _local_window(v, olon, olat, margin, lonname, latname):
+    """Select the lat/lon window within margin (degree) of a center."""
+    v = v.squeeze(drop=True)
+    
+    if set(v.dims) != {latname, lonname}:
+        raise Exception('a 2D lat/lon field is expected per track step, got ' +
+                        str(v.dims))
+    
+    dlon = margin / max(np.cos(np.deg2rad(min(abs(olat) + margin, 89.0))), 0.01)
+    
+    xs, ys = v[lonname].values, v[latname].values
+    
+    i0, _ = _bilinear_index(xs, np.clip([olon-dlon, olon+dlon], xs.min(), xs.max()))
+    j0, _ = _bilinear_index(ys, np.clip([olat-margin, olat+margin], ys.min(), ys.max()))
+    
+    return v.isel({lonname: slice(i0.min(), i0.max() + 2),
+                   latname: slice(j0.min(), j0.max() + 2)}
+                  ).transpose(latname, lonname)
+
+
+def _sample_window(data, wlon, wlat, lons, lats):
+    """Sample windowed numpy data (1, ny, nx) at given lat/lon positions."""
+    j0, i0, wy, wx = _bilinear_weights(wlon, wlat, lons[None], lats[None])
+    
+    return _bilinear_apply(data, j0, i0, wy, wx)[0]
+
+
+def _recenter(data, wlon, wlat, olon, olat, rad, criterion, azimNum, radiNum,
+              windRad):
+    """One iteration of the center relocation within a search radius."""
+    azim = np.linspace(0, 360-360/azimNum, azimNum)
+    radi = np.linspace(0, rad, radiNum)[:, None]
+    
+    lons, lats, _ = _cylind_points(olon, olat, azim, radi)
+    lons, lats = lons.ravel(), lats.ravel()
+    
+    if criterion == 'pressure':
+        score = _sample_window(data[0], wlon, wlat, lons, lats)
+        
+        if np.isnan(score).all():
+            return olon, olat
+        
+        idx = np.nanargmin(score)
+        
+        return lons[idx], lats[idx]
+    
+    elif criterion == 'vorticity':
+        vor = _sample_window(data[0], wlon, wlat, lons, lats) * np.sign(olat)
+        
+        # area weight ~ sin(r) in the cylindrical coordinate
+        wei = (np.sin(np.deg2rad(radi)) * np.ones_like(azim)).ravel()
+        wei = np.where(np.isfinite(vor) & (vor > 0), vor, 0) * wei
+        
+        if wei.sum() <= 0:
+            return olon, olat
+        
+        dlon = (lons - olon + 180.0) % 360.0 - 180.0
+        
+        return olon + (dlon * wei).sum() / wei.sum(), (lats * wei).sum() / wei.sum()
+    
+    else:
+        # all candidate cylinders are sampled in a single vectorized pass
+        wlons, wlats, wetas = _cylind_points(lons[:, None, None],
+                                             lats[:, None, None], azim,
+                                             np.linspace(0, windRad, radiNum)[:, None])
+        
+        u = _sample_window(data[0], wlon, wlat, wlons, wlats)
+        v = _sample_window(data[1], wlon, wlat, wlons, wlats)
+        
+        ut = _project(u, v, wetas)[0] * np.sign(olat)
+        score = ut.mean(axis=-1).max(axis=-1)
+        
+        if np.isnan(score).all():
+            return olon, olat
+        
+        idx = np.nanargmax(score)
+        
+        return lons[idx], lats[idx]
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+'''
+import numpy as np
+import xarray as xr
+
+
+_R_earth = 6371200.0
+_Omega = 7.292e-5
+
+
+'''
+Here defines the derived diagnostics in the cylindrical coordinate
+'''
+class CylindDiags(object):
+    """Derived diagnostics on the cylindrical grid
+
+    Compute diagnostics of the azimuthal/radial winds, e.g., from
+    `project_to_cylind` or `storm_relative`.  Every quantity is evaluated
+    only when it is first requested and then cached, so that the metric
+    factors, azimuthal means and derivatives are shared among diagnostics.
+    All operations are xarray ones, so dask-backed inputs stay lazy and are
+    evaluated chunk-wise.
+
+    The results keep the dimension order of ut (without azim for the
+    azimuthal-mean quantities).
+
+    The radius is the great-circle distance so the metric factor of the
+    azimuthal direction is R*sin(radi), and the azimuth increases
+    counter-clockwise from the north as in `load_cylind`.
+
+    Parameters
+    ----------
+    ut: xarray.DataArray
+        Azimuthal component of velocity, with dimensions of radi and azim
+    vr: xarray.DataArray
+        Radial component of velocity, with dimensions of radi and azim
+    olat: float or xarray.DataArray
+        Central latitude (degree) used for the Coriolis parameter, e.g.,
+        the track latitude along time
+    R: float
+        Radius of the earth (m)
+    Omega: float
+        Angular speed of the earth rotation (s^-1)
+    """
+    def __init__(self, ut, vr, olat, R=_R_earth, Omega=_Omega):
+        self.ut = ut
+        self.vr = vr
+        self.olat = olat
+        self.R = R
+        self.Omega = Omega
+        self._cache = {}
+
+    def diagnose(self, *names):
+        """Collect the requested diagnostics
+
+        Parameters
+        ----------
+        names: str
+            Names of the diagnostics, e.g., 'vor', 'div', 'angm', 'I2', 'uvEddy'
+
+        Return
+        ----------
+        re: xarray.Dataset
+            Requested diagnostics (still lazy for dask-backed inputs, call
+            `.compute()` on it to evaluate)
+        """
+        return xr.Dataset({name: getattr(self, name) for name in names})
+
+    def clear(self):
+        """Clear all the cached intermediates"""
+        self._cache.clear()
+
+    @property
+    def rs(self):
+        """Metric factor R*sin(radi) of the azimuthal direction (m)"""
+        return self._cached('rs', lambda: self.R * np.sin(np.deg2rad(self.ut.radi)))
+
+    @property
+    def f(self):
+        """Coriolis parameter at the center (s^-1)"""
+        return self._cached('f', lambda: 2.0 * self.Omega *
+                                         np.sin(np.deg2rad(self.olat)))
+
+    @property
+    def utm(self):
+        """Azimuthal mean of the azimuthal velocity"""
+        return self._cached('utm', lambda: self.ut.mean('azim'))
+
+    @property
+    def vrm(self):
+        """Azimuthal mean of the radial velocity"""
+        return self._cached('vrm', lambda: self.vr.mean('azim'))
+
+    @property
+    def vor(self):
+        """Relative vorticity (s^-1)"""
+        return self._cached('vor', lambda: self._ordered(
+            (self._ddr(self.rs * self.ut) - self._ddazim(self.vr)) * self._rinv
+            ).rename('vor'))
+
+    @property
+    def div(self):
+        """Horizontal divergence (s^-1)"""
+        return self._cached('div', lambda: self._ordered(
+            (self._ddr(self.rs * self.vr) + self._ddazim(self.ut)) * self._rinv
+            ).rename('div'))
+
+    @property
+    def vorm(self):
+        """Azimuthal-mean relative vorticity (s^-1)"""
+        return self._cached('vorm', lambda: self._ordered(
+            self._ddr(self.rs * self.utm) * self._rinv).rename('vorm'))
+
+    @property
+    def angm(self):
+        """Absolute angular momentum of the azimuthal-mean flow (m^2 s^-1)"""
+        return self._cached('angm', lambda: self._ordered(
+            self.rs * self.utm + self.f * self.rs**2 / 2.0).rename('angm'))
+
+    @property
+    def I2(self):
+        """Inertial stability of the azimuthal-mean flow (s^-2)"""
+        return self._cached('I2', lambda: self._ordered(
+            (self.f + 2.0 * self.utm * self._rinv) * (self.f + self.vorm)
+            ).rename('I2'))
+
+    @property
+    def uvEddy(self):
+        """Azimuthal-mean eddy flux u'v' of the azimuthal/radial velocity"""
+        return self._cached('uvEddy', lambda: self.eddy_flux(self.ut)
+                                                  .rename('uvEddy'))
+
+    def eddy_flux(self, q, name=None):
+        """Azimuthal-mean eddy radial flux of a variable
+
+        Parameters
+        ----------
+        q: xarray.DataArray
+            A variable on the cylindrical grid
+        name: str
+            Key to cache the result; not cached if None
+
+        Return
+        ----------
+        re: xarray.DataArray
+            Azimuthal mean of q'vr', with primes the deviations from the
+            azimuthal means
+        """
+        qm   = lambda: self.utm if q is self.ut else q.mean('azim')
+        func = lambda: self._ordered(((q - qm()) *
+                                      (self.vr - self.vrm)).mean('azim'))
+
+        return func() if name is None else self._cached('eddy_' + name, func)
+
+
+    '''
+    Below are the private helper methods
+    '''
+    def _cached(self, name, func):
+        if name not in self._cache:
+            self._cache[name] = func()
+
+        return self._cache[name]
+
+    def _ordered(self, q):
+        """Transpose q to the dimension order of ut"""
+        return q.transpose(*[d for d in self.ut.dims if d in q.dims], ...)
+
+    @property
+    def _rinv(self):
+        """1/rs, being NaN at the center"""
+        return self._cached('rinv', lambda: 1.0 / self.rs.where(self.rs > 0))
+
+    def _ddr(self, q):
+        """Radial derivative in m^-1, radi being in degree"""
+        return q.differentiate('radi', edge_order=2) / np.deg2rad(1.0) / self.R
+
+    def _ddazim(self, q):
+        """Periodic azimuthal derivative in radian^-1, azim being in degree"""
+        dazim = self._cached('dazim', lambda: np.deg2rad(
+                             float(q.azim[1] - q.azim[0])))
+
+        return (q.roll(azim=-1) - q.roll(azim=1)) / (2.0 * dazim)
+
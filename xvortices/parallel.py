@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 2026.10.19
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+'''
+import atexit
+import glob
+import multiprocessing
+import os
+import tempfile
+import uuid
+import numpy as np
+import xarray as xr
+
+
+'''
+Here defines the parallel mapping with zero-copy handoff of results
+'''
+def map_cylind(func, iterable, processes=None, tmpdir=None, context=None):
+    """Map a function over worker processes
+
+    Apply a function, e.g., a `functools.partial` of `load_cylind` or
+    `project_to_cylind`, to each item in worker processes.  Instead of
+    pickling the (large) results, each worker writes its arrays once into
+    memory-mapped buffers and only lightweight handles are sent back.  The
+    parent wraps the mapped buffers into xarray objects without any further
+    copy or deserialization.
+
+    The function is pickled to each worker only once when the pool starts,
+    not with every task, so it may capture the source dataset at the cost of
+    one copy per worker.  Only the items are sent per task.  On the first
+    failed task the pool is terminated, all the buffers are removed and the
+    error is raised.
+
+    With the 'spawn' (or 'forkserver') start method, func must be importable
+    by the workers (defined in a module, not in a notebook or an interactive
+    session) and scripts must call map_cylind under an
+    ``if __name__ == '__main__':`` guard.
+
+    Parameters
+    ----------
+    func: callable
+        A picklable function returning an xarray.DataArray, xarray.Dataset,
+        numpy.array, or (nested) list/tuple of them.  Other objects are
+        passed back through pickle as usual.
+    iterable: iterable
+        Items to be passed to func, one per call
+    processes: int
+        Number of worker processes, default to the number of CPUs
+    tmpdir: str
+        Directory of the buffers, default to /dev/shm (shared memory) if it
+        exists or the system temporary directory otherwise
+    context: str
+        Start method of the worker processes, default to the platform one
+        (e.g., 'fork' on Linux).  Forked workers may deadlock on thread pools
+        (e.g., dask's) already started in the parent, so pass 'spawn' if
+        func computes dask arrays after the parent has done so.
+
+    Return
+    ----------
+    re: list
+        Results of func in the order of iterable, with arrays backed by the
+        memory-mapped buffers
+    """
+    if tmpdir is None:
+        tmpdir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+    # buffers of this call share a prefix so those of killed tasks are found
+    prefix = os.path.join(tmpdir, 'xvortices-' + uuid.uuid4().hex + '-')
+    handles, done = [], False
+
+    try:
+        ctx = multiprocessing.get_context(context)
+
+        with ctx.Pool(processes, initializer=_init_worker,
+                      initargs=(func, prefix)) as pool:
+            # collect the handles as they arrive so all can be released
+            for h in pool.imap(_shared_call, iterable):
+                if isinstance(h, _TaskError):
+                    pool.terminate()
+                    raise h.exc
+
+                handles.append(h)
+
+        re = [_restore(h) for h in handles]
+        done = True
+    finally:
+        if not done:
+            for h in handles:
+                _release(h)
+
+            for path in glob.glob(glob.escape(prefix) + '*'):
+                _remove_quietly(path)
+
+    return re
+
+
+"""
+Below are the private helper methods
+"""
+_worker = {} # func and buffer prefix of a worker, set once by _init_worker
+
+
+def _init_worker(func, prefix):
+    _worker['func'] = func
+    _worker['prefix'] = prefix
+
+
+def _shared_call(item):
+    """Call func in a worker and share its results, or return the error."""
+    created = []
+
+    try:
+        return _share(_worker['func'](item), _worker['prefix'], created)
+    except Exception as e:
+        for path in created:
+            _remove_quietly(path)
+
+        return _TaskError(e)
+
+
+class _TaskError(object):
+    """Error of a task, returned instead of raised so no result is lost."""
+    def __init__(self, exc):
+        self.exc = exc
+
+
+class _SharedBuffer(object):
+    """Handle of a memory-mapped numpy buffer."""
+    def __init__(self, arr, prefix, created):
+        self.path = prefix + uuid.uuid4().hex
+        self.shape = arr.shape
+        self.dtype = arr.dtype
+
+        created.append(self.path)
+
+        mm = np.memmap(self.path, dtype=self.dtype, mode='w+',
+                       shape=self.shape or (1,))
+        mm[...] = arr.reshape(mm.shape)
+        mm.flush()
+        del mm
+
+    def restore(self):
+        mm = np.memmap(self.path, dtype=self.dtype, mode='r+',
+                       shape=self.shape or (1,))
+
+        # the mapping stays valid after unlinking on POSIX systems
+        try:
+            os.remove(self.path)
+        except OSError:
+            atexit.register(_remove_quietly, self.path)
+
+        return mm.reshape(self.shape)
+
+
+class _SharedArray(object):
+    """Handle of a xarray.DataArray with its data in a shared buffer."""
+    def __init__(self, da, prefix, created):
+        self.data = _share(np.asarray(da.values), prefix, created)
+        self.dims = da.dims
+        self.coords = {k: c.variable for k, c in da.coords.items()}
+        self.name = da.name
+        self.attrs = da.attrs
+
+    def restore(self):
+        return xr.DataArray(_restore(self.data), dims=self.dims,
+                            coords=self.coords, name=self.name,
+                            attrs=self.attrs)
+
+
+class _SharedDataset(object):
+    """Handle of a xarray.Dataset with its variables in shared buffers."""
+    def __init__(self, ds, prefix, created):
+        self.data_vars = {k: _SharedArray(v, prefix, created)
+                          for k, v in ds.data_vars.items()}
+        self.coords = {k: c.variable for k, c in ds.coords.items()}
+        self.attrs = ds.attrs
+
+    def restore(self):
+        return xr.Dataset({k: v.restore() for k, v in self.data_vars.items()},
+                          coords=self.coords, attrs=self.attrs)
+
+
+def _share(obj, prefix, created):
+    """Replace arrays in obj with handles of shared buffers.
+
+    Paths of the buffers are appended to created as they are written.
+    """
+    if isinstance(obj, xr.DataArray):
+        return _SharedArray(obj, prefix, created)
+    elif isinstance(obj, xr.Dataset):
+        return _SharedDataset(obj, prefix, created)
+    elif isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        return _SharedBuffer(obj, prefix, created)
+    elif type(obj) in [list, tuple]:
+        return type(obj)(_share(o, prefix, created) for o in obj)
+    else:
+        return obj
+
+
+def _restore(obj):
+    """Wrap the shared buffers referred by the handles in obj."""
+    if isinstance(obj, (_SharedBuffer, _SharedArray, _SharedDataset)):
+        return obj.restore()
+    elif type(obj) in [list, tuple]:
+        return type(obj)(_restore(o) for o in obj)
+    else:
+        return obj
+
+
+def _release(obj):
+    """Remove the shared buffers referred by the handles in obj."""
+    if isinstance(obj, _SharedBuffer):
+        _remove_quietly(obj.path)
+    elif isinstance(obj, _SharedArray):
+        _release(obj.data)
+    elif isinstance(obj, _SharedDataset):
+        for v in obj.data_vars.values():
+            _release(v)
+    elif type(obj) in [list, tuple]:
+        for o in obj:
+            _release(o)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+